@@ -0,0 +1,241 @@
+"""Field extraction shared by the scraper and the JSON-to-CSV/XLSX converter.
+
+`scrap.py` uses the tag helpers when building results, and
+`json_to_names_csv.py` uses the full set to turn items into output columns.
+"""
+import re
+import sys
+from typing import Any, Callable, Dict, List, Optional, Set
+
+# Optional multi-keyword matcher for category detection.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Optional Arrow compute kernels for batch category detection.
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
+# shared stand-in for a missing `tags` object; never mutated
+EMPTY_DICT: Dict[str, Any] = {}
+
+
+def extract_name(item: Dict[str, Any]) -> str:
+    # Prefer top-level 'name', fall back to 'tags.name' or empty string
+    name = item.get("name")
+    if name:
+        return name
+    tags = item.get("tags") or {}
+    return tags.get("name", "")
+
+
+# Tag keys looked up for every result, interned once so lookups and the
+# stored tag dicts share the same string objects
+ADDRESS_KEYS = tuple(sys.intern(k) for k in ("addr:housenumber", "addr:street", "addr:city", "addr:postcode", "addr:country"))
+ADDRESS_FALLBACK_KEYS = tuple(sys.intern(k) for k in ("addr:full", "contact:address"))
+PHONE_KEYS = tuple(sys.intern(k) for k in ("phone", "contact:phone", "telephone"))
+
+
+def extract_address(tags: Dict) -> str:
+    parts = []
+    for key in ADDRESS_KEYS:
+        v = tags.get(key)
+        if v:
+            parts.append(v)
+    if parts:
+        return ", ".join(parts)
+    # fallback to addr:full or 'contact:address'
+    return tags.get(ADDRESS_FALLBACK_KEYS[0]) or tags.get(ADDRESS_FALLBACK_KEYS[1]) or ""
+
+
+def extract_phone(tags: Dict) -> str:
+    for key in PHONE_KEYS:
+        if key in tags:
+            return tags[key]
+    return ""
+
+
+MADRASA_KEYWORDS = ["madrasa", "madrash", "মাদ্রাসা"]
+# "বিদ্যালয়" appears twice on purpose: with য + nukta and with the
+# precomposed য় (U+09DF), since OSM names use both spellings
+SCHOOL_KEYWORDS = ["school", "schooling", "বিদ্যালয়", "বিদ্যাল\u09df", "primary", "secondary"]
+COLLEGE_KEYWORDS = ["college", "university", "institute", "institute of", "কলেজ", "বিশ্ববিদ্যালয়"]
+
+# Name keywords per category, in the order determine_category checks them
+CATEGORY_KEYWORDS = (
+    ("madrasa", MADRASA_KEYWORDS),
+    ("school", SCHOOL_KEYWORDS),
+    ("college", COLLEGE_KEYWORDS),
+)
+
+
+def _keyword_pattern(keywords: List[str]) -> "re.Pattern[str]":
+    """Compile a list of plain substrings into one alternation regex."""
+    return re.compile("|".join(re.escape(kw) for kw in keywords))
+
+
+def _keyword_automaton() -> Any:
+    """Build one Aho-Corasick automaton mapping every keyword to its category."""
+    automaton = ahocorasick.Automaton()
+    for category, keywords in CATEGORY_KEYWORDS:
+        for kw in keywords:
+            automaton.add_word(kw, category)
+    automaton.make_automaton()
+    return automaton
+
+
+# compiled once at import; with pyahocorasick a name is scanned a single time,
+# otherwise once per category with a precompiled alternation
+KEYWORD_AUTOMATON = _keyword_automaton() if ahocorasick is not None else None
+KEYWORD_PATTERNS = [(category, _keyword_pattern(keywords)) for category, keywords in CATEGORY_KEYWORDS]
+
+
+def match_keyword_categories(name: str) -> Set[str]:
+    """Return the categories whose keywords occur in the (lowercased) `name`."""
+    if not name:
+        return set()
+    if KEYWORD_AUTOMATON is not None:
+        return {category for _, category in KEYWORD_AUTOMATON.iter(name)}
+    return {category for category, pattern in KEYWORD_PATTERNS if pattern.search(name)}
+
+
+def _categorize(tags: Dict, name: str, madrasa: bool, school: bool, college: bool) -> str:
+    # `madrasa`/`school`/`college`: whether that category's keywords occur in `name`
+    amenity = (tags.get("amenity") or "").lower()
+    building = (tags.get("building") or "").lower()
+    office = (tags.get("office") or "").lower()
+
+    # explicit tag checks
+    if amenity in ("school",):
+        return "school"
+    if amenity in ("college", "university") or building in ("college", "university"):
+        return "college"
+
+    # madrasa detection: keyword in name or a tag
+    if madrasa:
+        return "madrasa"
+    # also check tags that may indicate religious school
+    if tags.get("madrasa") or tags.get("religion") == "muslim" and "madrasa" in name:
+        return "madrasa"
+
+    # broader heuristics for schools vs colleges: name keywords
+    if school:
+        return "school"
+    if college:
+        return "college"
+
+    # office/building tags indicating education
+    if office in ("education", "training") or building in ("school",):
+        return "school"
+
+    return "other"
+
+
+def determine_category(item: Dict[str, Any], tags: Optional[Dict] = None) -> str:
+    """Determine whether an item is a 'school', 'college', 'madrasa', or 'other'.
+
+    Heuristics used (in order):
+    - Check explicit tags: amenity, building, office
+    - Check common keywords in name or tags (case-insensitive), including Bangla keywords
+    - Default to 'other'
+    """
+    if tags is None:
+        tags = (item.get("tags") or EMPTY_DICT)
+    name = (extract_name(item) or "").lower()
+    matched = match_keyword_categories(name)
+    return _categorize(tags, name, "madrasa" in matched, "school" in matched, "college" in matched)
+
+
+def _keyword_masks_arrow(names: List[str]) -> List[List[bool]]:
+    """One boolean mask per CATEGORY_KEYWORDS entry over lowercased `names`."""
+    arr = pa.array(names, type=pa.large_string())
+    return [
+        pc.match_substring_regex(arr, pattern.pattern).to_pylist()
+        for _, pattern in KEYWORD_PATTERNS
+    ]
+
+
+def determine_categories(items: List[Dict[str, Any]]) -> List[str]:
+    """`determine_category` for a whole batch of items.
+
+    With pyarrow installed, the name keyword scan runs as one Arrow regex
+    kernel per category over all names instead of once per item.
+    """
+    names = [(extract_name(it) or "").lower() for it in items]
+    if pa is not None and names:
+        madrasa, school, college = _keyword_masks_arrow(names)
+    else:
+        matched = [match_keyword_categories(n) for n in names]
+        madrasa = ["madrasa" in m for m in matched]
+        school = ["school" in m for m in matched]
+        college = ["college" in m for m in matched]
+    return [
+        _categorize(it.get("tags") or EMPTY_DICT, name, m, s, c)
+        for it, name, m, s, c in zip(items, names, madrasa, school, college)
+    ]
+
+
+# An extractor takes (item, tags) and returns the cell value for one field.
+Extractor = Callable[[Dict[str, Any], Dict], str]
+
+
+def _name(item: Dict[str, Any], tags: Dict) -> str:
+    return item.get("name") or tags.get("name") or ""
+
+
+def _address(item: Dict[str, Any], tags: Dict) -> str:
+    # Prefer top-level address, fall back to tags
+    return (item.get("address") or extract_address(tags) or "")
+
+
+def _phone(item: Dict[str, Any], tags: Dict) -> str:
+    return (item.get("phone") or extract_phone(tags) or "")
+
+
+def _category(item: Dict[str, Any], tags: Dict) -> str:
+    return determine_category(item, tags)
+
+
+def _text(v: Any) -> str:
+    # lazily loaded items (simdjson) hold nested objects/arrays as proxies;
+    # render those like the dict/list they stand for
+    as_plain = getattr(v, "as_dict", None) or getattr(v, "as_list", None)
+    return str(as_plain() if as_plain is not None else v)
+
+
+def _top_level(field: str) -> Extractor:
+    def extract(item: Dict[str, Any], tags: Dict) -> str:
+        v = item.get(field)
+        return _text(v) if v is not None else ""
+    return extract
+
+
+def _generic(field: str) -> Extractor:
+    # generic: top-level then tags
+    def extract(item: Dict[str, Any], tags: Dict) -> str:
+        return _text(item.get(field) or tags.get(field) or "")
+    return extract
+
+
+FIELD_EXTRACTORS: Dict[str, Extractor] = {
+    "name": _name,
+    "address": _address,
+    "phone": _phone,
+    "category": _category,
+}
+for _field in ("lat", "lon", "osm_id", "osm_type"):
+    FIELD_EXTRACTORS[_field] = _top_level(_field)
+
+
+def get_extractor(field: str) -> Extractor:
+    """Return the extractor for an already-stripped field name."""
+    return FIELD_EXTRACTORS.get(field) or _generic(field)
+
+
+def extract_value(item: Dict[str, Any], field: str) -> str:
+    return get_extractor(field.strip())(item, item.get("tags") or EMPTY_DICT)
@@ -9,25 +9,67 @@ Usage examples:
 import argparse
 import csv
 import json
-from typing import Any, Dict, List
+import mmap
+from typing import Any, Dict, Iterable, Iterator, List
 
+from _fields import EMPTY_DICT, determine_categories, get_extractor
 
-def extract_name(item: Dict[str, Any]) -> str:
-    # Prefer top-level 'name', fall back to 'tags.name' or empty string
-    name = item.get("name")
-    if name:
-        return name
-    tags = item.get("tags") or {}
-    return tags.get("name", "")
+# Optional fast JSON parsers: pysimdjson first, then orjson, then stdlib json.
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def load_json(path: str) -> List[Dict[str, Any]]:
+# buffer size for output files, so bulk writes hit the disk in large chunks
+WRITE_BUFFER_SIZE = 1 << 20
+
+# common keys that may contain the list of items in a top-level object
+LIST_KEYS = ("results", "elements", "items")
+
+
+def _iter_simdjson(path: str) -> Iterator[Any]:
+    """Yield items from `path` using simdjson over a memory-mapped file.
+
+    Items are simdjson proxies rather than dicts, so fields are only decoded
+    when a caller reads them. The parser and document stay referenced by
+    this generator so the proxies remain valid while items are consumed.
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        parser = simdjson.Parser()
+        doc = parser.parse(mm)
+        if isinstance(doc, simdjson.Object):
+            for key in LIST_KEYS:
+                if key in doc and isinstance(doc[key], simdjson.Array):
+                    doc = doc.at_pointer("/" + key)
+                    break
+            else:
+                # otherwise assume the dict itself represents a single item
+                yield doc
+                return
+        if isinstance(doc, simdjson.Array):
+            yield from doc
+
+
+def _read_json(path: str) -> Any:
+    if orjson is not None:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return orjson.loads(memoryview(mm))
     with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+        return json.load(f)
+
+
+def load_json(path: str) -> Iterable[Dict[str, Any]]:
+    if simdjson is not None:
+        return _iter_simdjson(path)
+    data = _read_json(path)
     # If top-level is a dict with a list under 'results' or similar, try to find list
     if isinstance(data, dict):
-        # common keys that may contain the list
-        for key in ("results", "elements", "items"):
+        for key in LIST_KEYS:
             if key in data and isinstance(data[key], list):
                 return data[key]
         # otherwise assume the dict itself represents a single item
@@ -44,155 +86,91 @@ def write_csv(names: List[str], out_path: str, encoding: str = "utf-8-sig") -> N
     recognizes UTF-8 and displays Bangla correctly.
     This function is kept for backward compatibility (single-column name output).
     """
-    with open(out_path, "w", newline="", encoding=encoding) as f:
+    with open(out_path, "w", newline="", encoding=encoding, buffering=WRITE_BUFFER_SIZE) as f:
         writer = csv.writer(f)
         writer.writerow(["name"])  # header
-        for n in names:
-            writer.writerow([n])
+        writer.writerows([n] for n in names)
 
 
-def write_rows_csv(rows: List[List[str]], headers: List[str], out_path: str, encoding: str = "utf-8-sig") -> None:
-    """Write rows (list of lists) to CSV with headers."""
-    with open(out_path, "w", newline="", encoding=encoding) as f:
+def write_rows_csv(rows: Iterable[List[str]], headers: List[str], out_path: str, encoding: str = "utf-8-sig") -> None:
+    """Write rows (list of lists) to CSV with headers.
+
+    Rows are written with a single `writerows` call through a large buffer;
+    csv.writer itself writes None as "" and str()s any other non-string cell.
+    """
+    with open(out_path, "w", newline="", encoding=encoding, buffering=WRITE_BUFFER_SIZE) as f:
         writer = csv.writer(f)
         writer.writerow(headers)
-        for r in rows:
-            writer.writerow(r)
+        writer.writerows(rows)
 
 
-def write_xlsx(names: List[str], out_path: str) -> None:
-    """Write names to an Excel .xlsx file using openpyxl.
+def _write_sheet(rows: Iterable[List[str]], headers: List[str], out_path: str, title: str) -> None:
+    """Stream rows into a single-sheet .xlsx file.
 
-    If `openpyxl` is not installed, instruct the user to install it.
+    Prefers xlsxwriter in constant_memory mode, falling back to a write-only
+    openpyxl workbook; neither keeps per-cell objects for the whole sheet.
     """
     try:
-        from openpyxl import Workbook
-    except Exception:
-        raise RuntimeError(
-            "Writing .xlsx requires openpyxl. Install with: pip install openpyxl"
-        )
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Names"
-    ws.append(["name"])  # header
-    for n in names:
-        ws.append([n])
-    wb.save(out_path)
-
+        import xlsxwriter
+    except ImportError:
+        xlsxwriter = None
+
+    if xlsxwriter is not None:
+        wb = xlsxwriter.Workbook(out_path, {"constant_memory": True, "strings_to_urls": False})
+        ws = wb.add_worksheet(title)
+        ws.write_row(0, 0, headers)
+        for i, r in enumerate(rows, 1):
+            ws.write_row(i, 0, r)
+        wb.close()
+        return
 
-def write_rows_xlsx(rows: List[List[str]], headers: List[str], out_path: str) -> None:
     try:
         from openpyxl import Workbook
     except Exception:
         raise RuntimeError(
-            "Writing .xlsx requires openpyxl. Install with: pip install openpyxl"
+            "Writing .xlsx requires xlsxwriter or openpyxl. Install with: pip install xlsxwriter"
         )
 
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Results"
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title)
     ws.append(headers)
     for r in rows:
         ws.append(r)
     wb.save(out_path)
 
 
-def extract_address(tags: Dict) -> str:
-    parts = []
-    for key in ("addr:housenumber", "addr:street", "addr:city", "addr:postcode", "addr:country"):
-        v = tags.get(key)
-        if v:
-            parts.append(v)
-    if parts:
-        return ", ".join(parts)
-    return tags.get("addr:full") or tags.get("contact:address") or ""
-
-
-def extract_phone(tags: Dict) -> str:
-    for key in ("phone", "contact:phone", "telephone"):
-        if key in tags:
-            return tags[key]
-    return ""
+def write_xlsx(names: List[str], out_path: str) -> None:
+    """Write names to an Excel .xlsx file using xlsxwriter or openpyxl.
 
+    If neither is installed, instruct the user to install one.
+    """
+    _write_sheet(([n] for n in names), ["name"], out_path, "Names")
 
-def determine_category(item: Dict[str, Any]) -> str:
-    """Determine whether an item is a 'school', 'college', 'madrasa', or 'other'.
 
-    Heuristics used (in order):
-    - Check explicit tags: amenity, building, office
-    - Check common keywords in name or tags (case-insensitive), including Bangla keywords
-    - Default to 'other'
-    """
-    tags = (item.get("tags") or {})
-    amenity = (tags.get("amenity") or "").lower()
-    building = (tags.get("building") or "").lower()
-    office = (tags.get("office") or "").lower()
-    name = (extract_name(item) or "").lower()
-
-    # explicit tag checks
-    if amenity in ("school",):
-        return "school"
-    if amenity in ("college", "university") or building in ("college", "university"):
-        return "college"
-
-    # madrasa detection: keyword in name or a tag
-    madrasa_keywords = ["madrasa", "madrash", "মাদ্রাসা", "মাদ্রাসা"]
-    for kw in madrasa_keywords:
-        if kw in name:
-            return "madrasa"
-    # also check tags that may indicate religious school
-    if tags.get("madrasa") or tags.get("religion") == "muslim" and "madrasa" in name:
-        return "madrasa"
-
-    # broader heuristics for schools vs colleges: name keywords
-    school_keywords = ["school", "schooling", "বিদ্যালয়", "বিদ্যালয়", "primary", "secondary"]
-    college_keywords = ["college", "university", "institute", "institute of", "কলেজ", "বিশ্ববিদ্যালয়"]
-    for kw in school_keywords:
-        if kw in name:
-            return "school"
-    for kw in college_keywords:
-        if kw in name:
-            return "college"
-
-    # office/building tags indicating education
-    if office in ("education", "training") or building in ("school",):
-        return "school"
-
-    return "other"
-
-
-def extract_value(item: Dict[str, Any], field: str) -> str:
-    tags = item.get("tags") or {}
-    field = field.strip()
-    if field == "name":
-        return extract_name(item) or ""
-    if field == "address":
-        # Prefer top-level address, fall back to tags
-        return (item.get("address") or extract_address(tags) or "")
-    if field == "phone":
-        return (item.get("phone") or extract_phone(tags) or "")
-    if field == "category":
-        return determine_category(item)
-    if field in ("lat", "lon", "osm_id", "osm_type"):
-        return str(item.get(field, "")) if item.get(field, None) is not None else ""
-    # generic: top-level then tags
-    return str(item.get(field) or tags.get(field) or "")
+def write_rows_xlsx(rows: List[List[str]], headers: List[str], out_path: str) -> None:
+    _write_sheet(rows, headers, out_path, "Results")
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Extract fields from JSON to CSV or XLSX")
     parser.add_argument("-i", "--input", required=True, help="Input JSON file path")
     parser.add_argument("-o", "--output", required=True, help="Output file path (CSV or XLSX)")
-    parser.add_argument("--xlsx", action="store_true", help="Write an Excel .xlsx file instead of CSV (requires openpyxl)")
+    parser.add_argument("--xlsx", action="store_true", help="Write an Excel .xlsx file instead of CSV (requires xlsxwriter or openpyxl)")
     parser.add_argument("--fields", default="name", help="Comma-separated fields to extract (default: name). E.g. --fields name,address,phone")
     args = parser.parse_args()
 
     items = load_json(args.input)
     fields = [f.strip() for f in args.fields.split(",") if f.strip()]
+    # columns computed for all items in one batch rather than row by row
+    precomputed: Dict[str, List[str]] = {}
+    if "category" in fields:
+        items = list(items)
+        precomputed["category"] = determine_categories(items)
+    cells = [(precomputed.get(f), get_extractor(f)) for f in fields]
     rows: List[List[str]] = []
-    for it in items:
-        row = [extract_value(it, f) for f in fields]
+    for i, it in enumerate(items):
+        tags = it.get("tags") or EMPTY_DICT
+        row = [col[i] if col is not None else e(it, tags) for col, e in cells]
         # include even if some fields are empty; drop entirely empty rows
         if any(cell for cell in row):
             rows.append(row)
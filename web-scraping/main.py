@@ -1,5 +1,5 @@
 import requests
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 url ="https://www.codewithharry.com/"
 
 #get the html file
@@ -7,15 +7,15 @@ r = requests.get(url)
 htmlContent = r.content 
 # print(htmlContent)
 
-#parse the html
-soup = BeautifulSoup(htmlContent, 'html.parser')
-# print(soup.prettify())
+#parse the html (selectolax wraps the Lexbor C parser)
+tree = LexborHTMLParser(htmlContent)
+# print(tree.html)
 # get the title of the html page
-title =soup.title
+title =tree.css_first('title')
 print(type(title))
 #get all the paragraphs from the page
-# print(soup.find_all('p'))
+# print(tree.css('p'))
 #get all anchor from the page
-# print(soup.find_all('a'))
-print(soup.find('p')['class'])
+# print(tree.css('a'))
+print(tree.css_first('p').attributes.get('class'))
 #printing the parsed data in a pretty way
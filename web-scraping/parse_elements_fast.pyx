@@ -0,0 +1,45 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""Compiled version of the per-element loop in `scrap._parse_chunk`.
+
+Build it in place with `cythonize -i web-scraping/parse_elements_fast.pyx`;
+scrap.py imports the built extension when present and falls back to the
+pure-Python loop otherwise. Both must accept and reject exactly the same
+elements.
+"""
+
+
+cpdef list parse_chunk_fast(list elements, bint strict, frozenset allowed_amenities,
+                            frozenset allowed_buildings, frozenset allowed_offices,
+                            object extract_address, object extract_phone, object record):
+    """Return `record(...)` for every named (and, if `strict`, institute-tagged) element."""
+    cdef list results = []
+    cdef dict el
+    cdef dict tags
+    cdef dict center
+    cdef object name
+    for el in elements:
+        tags = el.get("tags") or {}
+        name = tags.get("name")
+        if not name:
+            # skip unnamed objects (we only want named institutes)
+            continue
+
+        # In strict mode only accept objects with explicit institute tags
+        if strict and not (
+            tags.get("amenity", "").lower() in allowed_amenities
+            or tags.get("building", "").lower() in allowed_buildings
+            or tags.get("office", "").lower() in allowed_offices
+        ):
+            continue
+        center = el.get("center") or {}
+        results.append(record(
+            el.get("type"),
+            el.get("id"),
+            name,
+            extract_address(tags),
+            extract_phone(tags),
+            el.get("lat") or center.get("lat"),
+            el.get("lon") or center.get("lon"),
+            tags,
+        ))
+    return results
@@ -3,6 +3,8 @@
 Usage:
   - Provide a `--location` string (e.g. "Seattle, WA") to geocode via Nominatim,
 	or omit it to fall back to IP-based geolocation.
+  - Repeat `--location` to search around several places; with `aiohttp`
+	installed they are geocoded and queried concurrently.
   - Adjust `--radius` in meters (default 2000m).
   - Save results with `--output` (CSV or JSON determined by `--format`).
 
@@ -13,11 +15,49 @@ Notes:
 """
 
 import argparse
+import asyncio
 import csv
+import hashlib
+import itertools
 import json
 import os
+import re
 import requests
-from typing import Tuple, List, Dict, Optional
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from typing import IO, Any, Tuple, List, Dict, Iterable, Iterator, Optional
+
+from _fields import extract_address, extract_phone
+
+# Optional incremental JSON parser used to stream Overpass responses.
+try:
+	import ijson
+except ImportError:
+	ijson = None
+
+# Optional async HTTP client used to sweep several locations concurrently.
+try:
+	import aiohttp
+except ImportError:
+	aiohttp = None
+
+# Optional fast JSON encoder/decoder; stdlib json is used when missing.
+try:
+	import orjson
+except ImportError:
+	orjson = None
+
+# Optional compiled inner loop for `_parse_chunk` (parse_elements_fast.pyx),
+# used only when the extension has been built beforehand with
+#   cythonize -i web-scraping/parse_elements_fast.pyx
+try:
+	from parse_elements_fast import parse_chunk_fast
+except ImportError:
+	parse_chunk_fast = None
 
 # Prefer a contact email for Nominatim per usage policy. Set via env var `OSM_EMAIL`.
 OSM_EMAIL = os.getenv("OSM_EMAIL")
@@ -27,37 +67,136 @@ if OSM_EMAIL:
 else:
 	HEADERS = {"User-Agent": f"{default_user_agent} (+https://example.com)"}
 
+# Tag values accepted by `parse_elements` in strict mode
+ALLOWED_AMENITIES = frozenset({"school", "college", "university", "kindergarten", "library", "research"})
+ALLOWED_BUILDINGS = frozenset({"school", "college", "university"})
+ALLOWED_OFFICES = frozenset({"education", "training"})
 
-def geocode_location(location: Optional[str]) -> Tuple[float, float]:
-	"""Return (lat, lon). If `location` is None, fall back to IP-based geolocation."""
+# parse_elements hands unique elements to _parse_chunk in batches of this size
+PARSE_CHUNK_SIZE = 1000
+
+# rows handed to csv.writerows at a time by save_results
+SAVE_BATCH_SIZE = 4096
+
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+OVERPASS_URL = "https://overpass-api.de/api/interpreter"
+
+# Nominatim's usage policy allows at most one request per second
+NOMINATIM_MIN_INTERVAL = 1.0
+
+# Overpass requests in flight at once when sweeping several locations
+OVERPASS_CONCURRENCY = 2
+
+# Trailing `"remark": "..."` of an Overpass JSON response; matched against
+# the last OVERPASS_TAIL_SIZE bytes of a streamed body
+OVERPASS_REMARK_RE = re.compile(rb'"remark"\s*:\s*("(?:[^"\\]|\\.)*")\s*}\s*$')
+OVERPASS_TAIL_SIZE = 4096
+
+NOMINATIM_FORBIDDEN_HINT = (
+	"Nominatim returned 403 Forbidden.\n"
+	"This often occurs when the request lacks a proper User-Agent or contact email.\n"
+	"Set the environment variable `OSM_EMAIL` to your contact email and retry, e.g.:\n"
+	"  $env:OSM_EMAIL='you@example.com'; python .\\web-scraping\\scrap.py -l \"Shonir Akhra\" -r 3000 -o res.csv\n"
+)
+
+# On-disk cache of Overpass responses and Nominatim geocodes, keyed by a hash
+# of the request. Set OVERPASS_CACHE to move the file; entries expire after
+# CACHE_TTL seconds.
+CACHE_PATH = os.getenv("OVERPASS_CACHE", ".overpass_cache.sqlite")
+CACHE_TTL = 7 * 24 * 3600
+
+_session: Optional[requests.Session] = None
+_last_nominatim_request = 0.0
+
+
+def get_session() -> requests.Session:
+	"""Return the shared HTTP session so repeated calls reuse open connections."""
+	global _session
+	if _session is None:
+		_session = requests.Session()
+		_session.headers.update(HEADERS)
+	return _session
+
+
+def _wait_for_nominatim() -> None:
+	global _last_nominatim_request
+	delay = _last_nominatim_request + NOMINATIM_MIN_INTERVAL - time.monotonic()
+	if delay > 0:
+		time.sleep(delay)
+	_last_nominatim_request = time.monotonic()
+
+
+def _cache_key(kind: str, text: str) -> str:
+	return hashlib.blake2b(f"{kind}:{text}".encode("utf-8"), digest_size=20).hexdigest()
+
+
+def _cache_connect() -> sqlite3.Connection:
+	conn = sqlite3.connect(CACHE_PATH)
+	conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, created REAL, value BLOB)")
+	return conn
+
+
+def cache_get(key: str) -> Optional[Any]:
+	"""Return the cached value for `key`, or None if missing or expired."""
+	with closing(_cache_connect()) as conn:
+		row = conn.execute("SELECT created, value FROM cache WHERE key = ?", (key,)).fetchone()
+		if row is not None and time.time() - row[0] > CACHE_TTL:
+			with conn:
+				conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+			row = None
+	if row is None:
+		return None
+	return orjson.loads(row[1]) if orjson is not None else json.loads(row[1])
+
+
+def cache_set(key: str, value: Any) -> None:
+	"""Store `value` under `key` and drop any entries that have expired."""
+	data = orjson.dumps(value) if orjson is not None else json.dumps(value, ensure_ascii=False).encode("utf-8")
+	now = time.time()
+	with closing(_cache_connect()) as conn, conn:
+		conn.execute("DELETE FROM cache WHERE created < ?", (now - CACHE_TTL,))
+		conn.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?)", (key, now, data))
+
+
+def _nominatim_params(location: str) -> Dict[str, Any]:
+	params = {"q": location, "format": "json", "limit": 1}
+	# include email if available (recommended by Nominatim)
+	if OSM_EMAIL:
+		params["email"] = OSM_EMAIL
+	return params
+
+
+def geocode_location(location: Optional[str], use_cache: bool = True) -> Tuple[float, float]:
+	"""Return (lat, lon). If `location` is None, fall back to IP-based geolocation.
+
+	Nominatim results are cached on disk per location string unless
+	`use_cache` is False.
+	"""
 	if location:
-		url = "https://nominatim.openstreetmap.org/search"
-		params = {"q": location, "format": "json", "limit": 1}
-		# include email if available (recommended by Nominatim)
-		if OSM_EMAIL:
-			params["email"] = OSM_EMAIL
+		key = _cache_key("nominatim", location)
+		cached = cache_get(key) if use_cache else None
+		if cached is not None:
+			return cached[0], cached[1]
 		try:
-			resp = requests.get(url, params=params, headers=HEADERS, timeout=15)
+			_wait_for_nominatim()
+			resp = get_session().get(NOMINATIM_URL, params=_nominatim_params(location), timeout=15)
 			resp.raise_for_status()
 		except requests.exceptions.HTTPError as e:
 			# Provide a helpful hint for 403 Forbidden from Nominatim
 			if getattr(e.response, "status_code", None) == 403:
-				raise RuntimeError(
-					"Nominatim returned 403 Forbidden.\n"
-					"This often occurs when the request lacks a proper User-Agent or contact email.\n"
-					"Set the environment variable `OSM_EMAIL` to your contact email and retry, e.g.:\n"
-					"  $env:OSM_EMAIL='you@example.com'; python .\\web-scraping\\scrap.py -l \"Shonir Akhra\" -r 3000 -o res.csv\n"
-				) from e
+				raise RuntimeError(NOMINATIM_FORBIDDEN_HINT) from e
 			raise
 		data = resp.json()
 		if not data:
 			raise ValueError(f"Location not found via Nominatim: {location}")
 		lat = float(data[0]["lat"])
 		lon = float(data[0]["lon"])
+		if use_cache:
+			cache_set(key, [lat, lon])
 		return lat, lon
 
 	# fallback: IP-based lookup
-	resp = requests.get("https://ipinfo.io/json", headers=HEADERS, timeout=10)
+	resp = get_session().get("https://ipinfo.io/json", timeout=10)
 	resp.raise_for_status()
 	data = resp.json()
 	lat_str, lon_str = data.get("loc", "0,0").split(",")
@@ -68,138 +207,349 @@ def build_overpass_query(lat: float, lon: float, radius: int, mode: str = "stric
 	"""Build Overpass query. In `strict` mode, only request known institute tags.
 	In `loose` mode, include broader heuristics (name keywords, building/office heuristics).
 	"""
-	q = f"[out:json][timeout:45];("
+	around = f"(around:{radius},{lat},{lon})"
 	if mode == "strict":
 		# Request only common, explicit institute tags to reduce false positives
 		amenities = "school|college|university|kindergarten|library|research"
 		building_vals = "school|college|university"
 		office_vals = "education|training"
-
-		q += f"node[\"amenity\"~\"{amenities}\"](around:{radius},{lat},{lon});"
-		q += f"way[\"amenity\"~\"{amenities}\"](around:{radius},{lat},{lon});"
-		q += f"relation[\"amenity\"~\"{amenities}\"](around:{radius},{lat},{lon});"
-
-		q += f"node[\"building\"~\"{building_vals}\"](around:{radius},{lat},{lon});"
-		q += f"way[\"building\"~\"{building_vals}\"](around:{radius},{lat},{lon});"
-		q += f"relation[\"building\"~\"{building_vals}\"](around:{radius},{lat},{lon});"
-
-		q += f"node[\"office\"~\"{office_vals}\"](around:{radius},{lat},{lon});"
-		q += f"way[\"office\"~\"{office_vals}\"](around:{radius},{lat},{lon});"
-		q += f"relation[\"office\"~\"{office_vals}\"](around:{radius},{lat},{lon});"
+		filters = [("amenity", amenities), ("building", building_vals), ("office", office_vals)]
 	else:
 		# loose: include name heuristics and broader tags (previous behavior)
 		amenities = "school|college|university|kindergarten|training|research|library"
 		building_vals = "school|college|university|training"
 		office_vals = "education|training"
 		name_keywords = "Institute|Academy|Center|Centre|Training|College|University|School"
+		filters = [("amenity", amenities), ("building", building_vals), ("office", office_vals), ("name", name_keywords)]
 
-		q += f"node[\"amenity\"~\"{amenities}\"](around:{radius},{lat},{lon});"
-		q += f"way[\"amenity\"~\"{amenities}\"](around:{radius},{lat},{lon});"
-		q += f"relation[\"amenity\"~\"{amenities}\"](around:{radius},{lat},{lon});"
+	# `nwr` covers node, way and relation in one statement; the union returns
+	# each matching element once even when several filters select it
+	q = f"[out:json][timeout:45];("
+	for key, values in filters:
+		q += f"nwr[\"{key}\"~\"{values}\"]{around};"
+	q += ");out center tags;"
+	return q
 
-		q += f"node[\"building\"~\"{building_vals}\"](around:{radius},{lat},{lon});"
-		q += f"way[\"building\"~\"{building_vals}\"](around:{radius},{lat},{lon});"
-		q += f"relation[\"building\"~\"{building_vals}\"](around:{radius},{lat},{lon});"
 
-		q += f"node[\"office\"~\"{office_vals}\"](around:{radius},{lat},{lon});"
-		q += f"way[\"office\"~\"{office_vals}\"](around:{radius},{lat},{lon});"
-		q += f"relation[\"office\"~\"{office_vals}\"](around:{radius},{lat},{lon});"
+def query_overpass(lat: float, lon: float, radius: int, use_cache: bool = True) -> Iterator[Dict]:
+	"""Yield Overpass elements, from the on-disk cache when possible.
 
-		q += f"node[\"name\"~\"{name_keywords}\"](around:{radius},{lat},{lon});"
-		q += f"way[\"name\"~\"{name_keywords}\"](around:{radius},{lat},{lon});"
-		q += f"relation[\"name\"~\"{name_keywords}\"](around:{radius},{lat},{lon});"
+	On a cache miss the response is fetched and the elements are stored once
+	they have all been read (see `_cache_overpass` for what is left out); pass
+	`use_cache=False` to always query Overpass.
+	"""
+	query = build_overpass_query(lat, lon, radius)
+	if not use_cache:
+		yield from _fetch_overpass(query)
+		return
 
-	q += ");out center tags;"
-	return q
+	key = _cache_key("overpass", query)
+	cached = cache_get(key)
+	if cached is not None:
+		yield from cached
+		return
+	elements = []
+	status: Dict[str, Any] = {}
+	for el in _fetch_overpass(query, status):
+		elements.append(el)
+		yield el
+	_cache_overpass(key, elements, status.get("remark"))
+
+
+def _cache_overpass(key: str, elements: List[Dict], remark: Optional[str]) -> None:
+	"""Cache an Overpass result unless it is empty or carries a `remark`.
+
+	Overpass reports timeouts and memory aborts with HTTP 200 and a `remark`
+	next to a partial (often empty) element list; those must not be reused.
+	"""
+	if remark:
+		print(f"Overpass remark: {remark} (result not cached)", file=sys.stderr)
+		return
+	if elements:
+		cache_set(key, elements)
+
+
+def _fetch_overpass(query: str, status: Optional[Dict[str, Any]] = None) -> Iterator[Dict]:
+	"""Yield Overpass elements as they are decoded from the response body.
+
+	With `ijson` installed the body is parsed incrementally while it downloads.
+	Once the body is exhausted, the response's `remark` (or None) is stored
+	in `status["remark"]`.
+	"""
+	if status is None:
+		status = {}
+	resp = get_session().post(OVERPASS_URL, data=query.encode("utf-8"), timeout=60, stream=True)
+	with resp:
+		resp.raise_for_status()
+		if ijson is None:
+			data = orjson.loads(resp.content) if orjson is not None else resp.json()
+			yield from data.get("elements", [])
+			status["remark"] = data.get("remark")
+			return
+		resp.raw.decode_content = True
+		body = _TailReader(resp.raw)
+		yield from ijson.items(body, "elements.item", use_float=True)
+		status["remark"] = _overpass_remark(body.tail)
+
+
+class _TailReader:
+	"""Read-through wrapper keeping the last OVERPASS_TAIL_SIZE bytes read."""
+
+	def __init__(self, raw: Any) -> None:
+		self._raw = raw
+		self.tail = b""
+
+	def read(self, size: int = -1) -> bytes:
+		data = self._raw.read(size)
+		if data:
+			self.tail = (self.tail + data)[-OVERPASS_TAIL_SIZE:]
+		return data
+
+
+def _overpass_remark(tail: bytes) -> Optional[str]:
+	# Overpass writes the remark as the last key of the document, after the
+	# elements array, so it can be read from the end of the body alone
+	m = OVERPASS_REMARK_RE.search(tail)
+	return json.loads(m.group(1)) if m else None
+
+
+def _decode_elements(body: bytes) -> Tuple[List[Dict], Optional[str]]:
+	data = orjson.loads(body) if orjson is not None else json.loads(body)
+	return data.get("elements", []), data.get("remark")
+
+
+async def _geocode_async(session: "aiohttp.ClientSession", lock: asyncio.Lock, location: str, use_cache: bool) -> Tuple[float, float]:
+	global _last_nominatim_request
+	key = _cache_key("nominatim", location)
+	cached = cache_get(key) if use_cache else None
+	if cached is not None:
+		return cached[0], cached[1]
+	# the lock serialises Nominatim calls so they stay one second apart
+	async with lock:
+		delay = _last_nominatim_request + NOMINATIM_MIN_INTERVAL - time.monotonic()
+		if delay > 0:
+			await asyncio.sleep(delay)
+		_last_nominatim_request = time.monotonic()
+		async with session.get(NOMINATIM_URL, params=_nominatim_params(location), timeout=aiohttp.ClientTimeout(total=15)) as resp:
+			if resp.status == 403:
+				raise RuntimeError(NOMINATIM_FORBIDDEN_HINT)
+			resp.raise_for_status()
+			data = await resp.json(content_type=None)
+	if not data:
+		raise ValueError(f"Location not found via Nominatim: {location}")
+	lat, lon = float(data[0]["lat"]), float(data[0]["lon"])
+	if use_cache:
+		cache_set(key, [lat, lon])
+	return lat, lon
 
 
-def query_overpass(lat: float, lon: float, radius: int) -> List[Dict]:
-	url = "https://overpass-api.de/api/interpreter"
+async def _query_overpass_async(session: "aiohttp.ClientSession", semaphore: asyncio.Semaphore, lat: float, lon: float, radius: int, use_cache: bool) -> List[Dict]:
 	query = build_overpass_query(lat, lon, radius)
-	resp = requests.post(url, data=query.encode("utf-8"), headers=HEADERS, timeout=60)
-	resp.raise_for_status()
-	data = resp.json()
-	return data.get("elements", [])
+	key = _cache_key("overpass", query)
+	cached = cache_get(key) if use_cache else None
+	if cached is not None:
+		return cached
+	async with semaphore:
+		async with session.post(OVERPASS_URL, data=query.encode("utf-8")) as resp:
+			resp.raise_for_status()
+			body = await resp.read()
+	# decode off the event loop so other responses keep downloading
+	elements, remark = await asyncio.get_running_loop().run_in_executor(None, _decode_elements, body)
+	if use_cache:
+		_cache_overpass(key, elements, remark)
+	return elements
 
 
-def extract_address(tags: Dict) -> str:
-	parts = []
-	for key in ("addr:housenumber", "addr:street", "addr:city", "addr:postcode", "addr:country"):
-		v = tags.get(key)
-		if v:
-			parts.append(v)
-	if parts:
-		return ", ".join(parts)
-	# fallback to addr:full or 'contact:address'
-	return tags.get("addr:full") or tags.get("contact:address") or ""
+async def sweep_locations_async(locations: List[str], radius: int, use_cache: bool = True, concurrency: int = OVERPASS_CONCURRENCY) -> List[Dict]:
+	"""Geocode every location and query Overpass around each, concurrently.
 
+	Nominatim calls are spaced one second apart and at most `concurrency`
+	Overpass requests run at once; geocoding the next location overlaps with
+	the Overpass queries already in flight. Returns the raw elements of all
+	locations in order, duplicates included.
+	"""
+	lock = asyncio.Lock()
+	semaphore = asyncio.Semaphore(concurrency)
+	timeout = aiohttp.ClientTimeout(total=60)
+	async with aiohttp.ClientSession(headers=HEADERS, timeout=timeout) as session:
+		async def one(location: str) -> List[Dict]:
+			lat, lon = await _geocode_async(session, lock, location, use_cache)
+			return await _query_overpass_async(session, semaphore, lat, lon, radius, use_cache)
+
+		per_location = await asyncio.gather(*(one(loc) for loc in locations))
+	return list(itertools.chain.from_iterable(per_location))
 
-def extract_phone(tags: Dict) -> str:
-	for key in ("phone", "contact:phone", "telephone"):
-		if key in tags:
-			return tags[key]
-	return ""
 
+def sweep_locations(locations: List[str], radius: int, use_cache: bool = True) -> Iterable[Dict]:
+	"""Raw Overpass elements around every location in `locations`.
 
-def parse_elements(elements: List[Dict], mode: str = "strict") -> List[Dict]:
+	Uses `sweep_locations_async` when aiohttp is installed, otherwise queries
+	the locations one after another.
+	"""
+	if aiohttp is not None:
+		return asyncio.run(sweep_locations_async(locations, radius, use_cache))
+	return itertools.chain.from_iterable(
+		query_overpass(*geocode_location(loc, use_cache), radius, use_cache) for loc in locations
+	)
+
+
+@dataclass
+class Institute:
+	"""One parsed institute; slotted so large result sets stay compact."""
+	__slots__ = ("osm_type", "osm_id", "name", "address", "phone", "lat", "lon", "tags")
+
+	osm_type: Optional[str]
+	osm_id: Optional[int]
+	name: str
+	address: str
+	phone: str
+	lat: Optional[float]
+	lon: Optional[float]
+	tags: Dict[str, str]
+
+	def to_dict(self) -> Dict[str, Any]:
+		return {k: getattr(self, k) for k in self.__slots__}
+
+
+def _parse_element(el: Dict, mode: str = "strict") -> Optional[Institute]:
+	"""Turn one Overpass element into an `Institute`, or None if it is filtered out."""
+	# read every field we need exactly once per element
+	tags = el.get("tags") or {}
+	name = tags.get("name")
+	if not name:
+		# skip unnamed objects (we only want named institutes)
+		return None
+
+	# In strict mode only accept objects with explicit institute tags
+	if mode == "strict":
+		amenity = tags.get("amenity", "").lower()
+		building = tags.get("building", "").lower()
+		office = tags.get("office", "").lower()
+
+		if not (amenity in ALLOWED_AMENITIES or building in ALLOWED_BUILDINGS or office in ALLOWED_OFFICES):
+			# skip if it doesn't have explicit institute tags
+			return None
+	center = el.get("center") or {}
+	return Institute(
+		osm_type=el.get("type"),
+		osm_id=el.get("id"),
+		name=name,
+		address=extract_address(tags),
+		phone=extract_phone(tags),
+		lat=el.get("lat") or center.get("lat"),
+		lon=el.get("lon") or center.get("lon"),
+		tags=tags,
+	)
+
+
+def _parse_chunk(elements: List[Dict], mode: str = "strict") -> List[Institute]:
+	"""Parse a batch of elements, with the compiled loop when it is available."""
+	if parse_chunk_fast is not None:
+		return parse_chunk_fast(
+			elements, mode == "strict", ALLOWED_AMENITIES, ALLOWED_BUILDINGS, ALLOWED_OFFICES,
+			extract_address, extract_phone, Institute,
+		)
 	results = []
+	for el in elements:
+		r = _parse_element(el, mode)
+		if r is not None:
+			results.append(r)
+	return results
+
+
+def _unique_elements(elements: Iterable[Dict]) -> Iterator[Dict]:
+	# Deduplicate by element type+id to avoid duplicates from multiple queries
 	seen = set()
 	for el in elements:
-		# Deduplicate by element type+id to avoid duplicates from multiple queries
-		el_id = (el.get("type"), el.get("id"))
-		if el_id in seen:
+		key = (el.get("type"), el.get("id"))
+		if key in seen:
 			continue
-		seen.add(el_id)
+		seen.add(key)
+		yield el
 
-		tags = el.get("tags", {})
-		name = tags.get("name")
-		if not name:
-			# skip unnamed objects (we only want named institutes)
-			continue
 
-		# In strict mode only accept objects with explicit institute tags
-		if mode == "strict":
-			amenity = tags.get("amenity", "").lower()
-			building = tags.get("building", "").lower()
-			office = tags.get("office", "").lower()
-			allowed_amenities = {"school", "college", "university", "kindergarten", "library", "research"}
-			allowed_buildings = {"school", "college", "university"}
-			allowed_offices = {"education", "training"}
-
-			if not (amenity in allowed_amenities or building in allowed_buildings or office in allowed_offices):
-				# skip if it doesn't have explicit institute tags
-				continue
-		lat = el.get("lat") or (el.get("center") or {}).get("lat")
-		lon = el.get("lon") or (el.get("center") or {}).get("lon")
-		address = extract_address(tags)
-		phone = extract_phone(tags)
-		results.append({
-			"osm_type": el.get("type"),
-			"osm_id": el.get("id"),
-			"name": name,
-			"address": address,
-			"phone": phone,
-			"lat": lat,
-			"lon": lon,
-			"tags": tags,
-		})
-	return results
+def _chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+	it = iter(items)
+	while True:
+		chunk = list(itertools.islice(it, size))
+		if not chunk:
+			return
+		yield chunk
+
+
+def parse_elements(elements: Iterable[Dict], mode: str = "strict") -> Iterator[Institute]:
+	"""Yield parsed institutes from Overpass elements, in input order."""
+	for chunk in _chunked(_unique_elements(elements), PARSE_CHUNK_SIZE):
+		yield from _parse_chunk(chunk, mode)
+
+
+def _dumps_indented(obj: Any) -> str:
+	if orjson is not None:
+		return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+	return json.dumps(obj, ensure_ascii=False, indent=2)
+
+
+def _as_dict(r: Any) -> Dict:
+	return r.to_dict() if isinstance(r, Institute) else r
+
 
+def _write_json_stream(results: Iterable[Any], f) -> int:
+	"""Write `results` as an indented JSON array one item at a time.
 
-def save_results(results: List[Dict], output: str, fmt: str = "csv"):
+	Produces the same layout as `json.dump(..., indent=2)` without first
+	collecting the results into a list.
+	"""
+	count = 0
+	for r in results:
+		item = _dumps_indented(_as_dict(r)).replace("\n", "\n  ")
+		f.write(("[\n  " if count == 0 else ",\n  ") + item)
+		count += 1
+	f.write("\n]" if count else "[]")
+	return count
+
+
+@contextmanager
+def _replace_on_success(output: str, **open_kwargs: Any) -> Iterator[IO[str]]:
+	"""Open a temporary file next to `output` and move it over `output` only
+	if the block finishes; on error the temporary file is removed and any
+	existing `output` is left untouched."""
+	directory, base = os.path.split(os.path.abspath(output))
+	fd, tmp_path = tempfile.mkstemp(prefix=f".{base}.", suffix=".part", dir=directory)
+	# mkstemp creates the file 0600; give it the mode open() would have used
+	umask = os.umask(0)
+	os.umask(umask)
+	os.chmod(tmp_path, 0o666 & ~umask)
+	try:
+		with open(fd, "w", **open_kwargs) as f:
+			yield f
+		os.replace(tmp_path, output)
+	except BaseException:
+		os.unlink(tmp_path)
+		raise
+
+
+def save_results(results: Iterable[Any], output: str, fmt: str = "csv") -> int:
+	"""Write results (`Institute` records or dicts) as they are produced.
+
+	`results` may be a lazy stream backed by network requests; `output` is
+	only replaced once the whole stream has been written. Returns how many
+	results were written.
+	"""
 	if fmt == "json" or output.lower().endswith(".json"):
-		with open(output, "w", encoding="utf-8") as f:
-			json.dump(results, f, ensure_ascii=False, indent=2)
-		return
+		with _replace_on_success(output, encoding="utf-8") as f:
+			return _write_json_stream(results, f)
 
 	# default CSV
 	keys = ["name", "address", "phone", "lat", "lon"]
-	with open(output, "w", newline="", encoding="utf-8") as f:
-		writer = csv.DictWriter(f, fieldnames=keys)
-		writer.writeheader()
-		for r in results:
-			row = {k: r.get(k, "") for k in keys}
-			writer.writerow(row)
+	count = 0
+	with _replace_on_success(output, newline="", encoding="utf-8") as f:
+		writer = csv.writer(f)
+		writer.writerow(keys)
+		rows = ([d.get(k, "") for k in keys] for d in map(_as_dict, results))
+		for batch in _chunked(rows, SAVE_BATCH_SIZE):
+			writer.writerows(batch)
+			count += len(batch)
+	return count
 
 
 # def main():
@@ -225,16 +575,9 @@ def save_results(results: List[Dict], output: str, fmt: str = "csv"):
 
 # if __name__ == "__main__":
 # 	main()
-def main():
-    parser = argparse.ArgumentParser(description="Find nearby institutes using OSM Overpass API")
-    parser.add_argument("--location", "-l", help="Location string to geocode (e.g. 'Boston, MA')")
-    parser.add_argument("--radius", "-r", type=int, default=2000, help="Radius in meters (default 2000)")
-    parser.add_argument("--output", "-o", default="results.csv", help="Output file (CSV or JSON)")
-    parser.add_argument("--format", "-f", choices=["csv", "json"], default=None, help="Output format (csv/json)")
-    parser.add_argument("--lat", type=float, help="Explicit latitude coordinate.")
-    parser.add_argument("--lon", type=float, help="Explicit longitude coordinate.")
-    args = parser.parse_args()
 
+
+def _single_location_elements(args: argparse.Namespace, use_cache: bool) -> Iterator[Dict]:
     # --- Priority Logic for Coordinates ---
     if args.lat is not None and args.lon is not None:
         lat, lon = args.lat, args.lon
@@ -245,18 +588,39 @@ def main():
         print(f"Using default hardcoded coordinates (Dhaka): {lat}, {lon}")
     else:
         # Fallback to geocoding or IP lookup
-        lat, lon = geocode_location(args.location)
+        lat, lon = geocode_location(args.location[0] if args.location else None, use_cache)
         print(f"Using determined coordinates: {lat}, {lon}")
     # --------------------------------------
 
-    elements = query_overpass(lat, lon, args.radius)
-    print(f"Found {len(elements)} raw elements from Overpass")
+    # elements are filtered and written as they stream in from Overpass
+    return query_overpass(lat, lon, args.radius, use_cache)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find nearby institutes using OSM Overpass API")
+    parser.add_argument("--location", "-l", action="append", help="Location string to geocode (e.g. 'Boston, MA'); repeat to search around several locations")
+    parser.add_argument("--radius", "-r", type=int, default=2000, help="Radius in meters (default 2000)")
+    parser.add_argument("--output", "-o", default="results.csv", help="Output file (CSV or JSON)")
+    parser.add_argument("--format", "-f", choices=["csv", "json"], default=None, help="Output format (csv/json)")
+    parser.add_argument("--lat", type=float, help="Explicit latitude coordinate.")
+    parser.add_argument("--lon", type=float, help="Explicit longitude coordinate.")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore the on-disk Nominatim/Overpass cache and always query the APIs")
+    args = parser.parse_args()
+    use_cache = not args.no_cache
+
+    if args.location and len(args.location) > 1:
+        if args.lat is not None or args.lon is not None:
+            parser.error("--lat/--lon cannot be combined with more than one --location")
+        # several locations: geocode and query them concurrently, then merge
+        print(f"Searching around {len(args.location)} locations")
+        elements = sweep_locations(args.location, args.radius, use_cache)
+    else:
+        elements = _single_location_elements(args, use_cache)
     results = parse_elements(elements)
-    print(f"Parsed {len(results)} institutes with names")
 
     outfmt = args.format or ("json" if args.output.lower().endswith(".json") else "csv")
-    save_results(results, args.output, outfmt)
-    print(f"Saved {len(results)} results to {args.output}")
+    count = save_results(results, args.output, outfmt)
+    print(f"Saved {count} institutes with names to {args.output}")
 
 
 if __name__ == "__main__":